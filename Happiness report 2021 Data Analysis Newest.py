@@ -52,6 +52,11 @@
 # In[1]:
 
 
+import itertools
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
 import panel as pn
@@ -63,6 +68,10 @@ import plotly.graph_objects as go
 import plotly.express as px
 import matplotlib.pyplot as plt
 from matplotlib.ticker import FixedLocator
+from matplotlib.animation import FuncAnimation, PillowWriter
+from matplotlib.lines import Line2D
+from scipy import stats
+from region_permutation import permutation_pair_test
 import ipywidgets as widgets
 from IPython.display import display
 pn.extension('tabulator', sizing_mode="stretch_width")
@@ -87,7 +96,8 @@ plt.rcParams['figure.facecolor'] = '#FFE5B4'
 # In[3]:
 
 
-data = pd.read_csv('C:\\Users\\ccalv\\Desktop\\ADS Sem 1\\Computer Programming\\Project\\world-happiness-report-2021.csv')
+data_path = 'C:\\Users\\ccalv\\Desktop\\ADS Sem 1\\Computer Programming\\Project\\world-happiness-report-2021.csv'
+data = pd.read_csv(data_path)
 
 
 # In[4]:
@@ -101,11 +111,11 @@ data.head()
 # - **Dropping Unwanted Columns:**
 # We start by creating a list called data_columns that contains the names of the columns we want to keep in our dataset. These columns are the ones that provide valuable information for our analysis. Any columns not included in this list are considered unwanted and will be dropped from the dataset.
 # 
-# Next, we use the data_columns list to select only the desired columns from the original dataset, using the .copy() method to create a new copy of the DataFrame. This ensures that any modifications made to the new DataFrame do not affect the original dataset.
+# Next, the desired columns are selected from the original dataset by `happiness_pipeline()` below. The selection creates a new DataFrame, so any modifications made to it do not affect the original dataset in `data`.
 # 
 # 
 # - **Changing Variable Names:**
-# After selecting the desired columns, we proceed to change the variable names to make them more descriptive and easier to work with. We use the .rename() method on the DataFrame data and provide a dictionary where the keys are the original column names, and the values are the new column names we want to assign.
+# After selecting the desired columns, we proceed to change the variable names to make them more descriptive and easier to work with. We use the .rename() method on the DataFrame data and provide a dictionary where the keys are the original column names, and the values are the new column names we want to assign. The selection and renaming are done by `happiness_pipeline()` below, which also calculates the regional summaries used later in the notebook.
 # 
 # By renaming the variables, we can improve the clarity of the dataset and make it easier to refer to specific columns during analysis.
 # 
@@ -119,18 +129,12 @@ data.head()
 data_columns = ['Country name', 'Regional indicator', 'Happiness score', 'Logged GDP per capita', 'Social support', 'Healthy life expectancy', 'Freedom to make life choices', 'Generosity', 'Perceptions of corruption']
 
 
-# In[6]:
-
-
-data = data[data_columns].copy()
-
-
 # #### changing the variable names
 
 # In[7]:
 
 
-happy_df = data.rename(columns={
+column_names = {
     'Country name':'country_name', 
     'Regional indicator':'regional_indicator', 
     'Happiness score':'happiness_score', 
@@ -140,7 +144,142 @@ happy_df = data.rename(columns={
     'Freedom to make life choices':'freedom_to_make_life_choices', 
     'Generosity':'generosity', 
     'Perceptions of corruption':'perceptions_of_corruption'
-})
+}
+
+
+# ### Running the analysis on pandas or Polars
+# 
+# The main analysis steps of this notebook (renaming the columns, the `groupby` aggregations by region, sorting by happiness score and the correlation matrix) could be written directly with pandas. For bigger inputs, such as many years of reports or the individual survey responses, the same steps should also be able to run on the lazy, multi-threaded Polars engine. The code below writes the analysis steps once against a small backend interface so the two engines can be swapped without copying the analysis code, and the rest of the notebook reads its results.
+# 
+# - `PandasBackend` and `PolarsBackend` both provide the same methods: `read_csv()`, `from_pandas()`, `select_rename()`, `group_agg()`, `sort()`, `corr()` and `collect_all()`.
+# 
+# - `happiness_pipeline()` takes either the path of a csv file or a pandas DataFrame that has already been loaded, such as `data`, so the csv does not have to be read twice. Converting a DataFrame with text columns to Polars needs `pyarrow`.
+# 
+# - `PolarsBackend` uses `pl.scan_csv()`, so nothing is read until `collect_all()` is called. `pl.collect_all()` then runs every result in one query plan, sharing the csv scan and using all CPU cores.
+# 
+# - `group_agg()` drops rows with a missing group key and sorts the groups by their key, and `sort()` puts missing values last and keeps the original order of ties, so both backends return the same rows in the same order as pandas' `groupby()` and `sort_values()`.
+# 
+# - `corr()` returns the correlation matrix with a `variable` column instead of an index, and missing values are dropped pair by pair on both engines, the same as `DataFrame.corr()`.
+# 
+# - `happiness_pipeline()` is the analysis itself. It returns pandas DataFrames for `happy_df`, `sorted_happy_df` (by happiness score), `sorted_by_corruption`, `gdp_region`, `total_country`, `corruption`, `region_scores` and `correlation_matrix`, whichever backend was used.
+# 
+# Polars is optional, `PolarsBackend` can only be used when it is installed.
+
+# In[34]:
+
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+
+class PandasBackend:
+    name = 'pandas'
+
+    def read_csv(self, path):
+        return pd.read_csv(path, encoding='utf-8-sig')
+
+    def from_pandas(self, df):
+        return df
+
+    def select_rename(self, df, columns):
+        return df[list(columns)].rename(columns=columns)
+
+    def group_agg(self, df, by, column, how):
+        return df.groupby(by)[column].agg(how).reset_index()
+
+    def sort(self, df, column, ascending=True):
+        return df.sort_values(column, ascending=ascending, kind='stable').reset_index(drop=True)
+
+    def corr(self, df, columns):
+        return df[columns].corr().rename_axis('variable').reset_index()
+
+    def collect_all(self, results):
+        return results
+
+
+class PolarsBackend:
+    name = 'polars'
+
+    def __init__(self):
+        if pl is None:
+            raise ImportError('PolarsBackend requires polars, install it with `pip install polars`')
+
+    def read_csv(self, path):
+        return pl.scan_csv(path)
+
+    def from_pandas(self, df):
+        return pl.from_pandas(df).lazy()
+
+    def select_rename(self, df, columns):
+        return df.select([pl.col(old).alias(new) for old, new in columns.items()])
+
+    def group_agg(self, df, by, column, how):
+        return df.filter(pl.col(by).is_not_null()).group_by(by).agg(getattr(pl.col(column), how)()).sort(by)
+
+    def sort(self, df, column, ascending=True):
+        return df.sort(column, descending=not ascending, nulls_last=True, maintain_order=True)
+
+    def corr(self, df, columns):
+        rows = [df.select([pl.lit(a).alias('variable')] + [pl.corr(a, b).alias(b) for b in columns]) for a in columns]
+        return pl.concat(rows)
+
+    def collect_all(self, results):
+        frames = pl.collect_all(list(results.values()))
+        return {name: pd.DataFrame(frame.to_dict(as_series=False)) for name, frame in zip(results, frames)}
+
+
+def happiness_pipeline(backend, source):
+    df = backend.from_pandas(source) if isinstance(source, pd.DataFrame) else backend.read_csv(source)
+    df = backend.select_rename(df, column_names)
+    numeric_columns = [column for column in column_names.values() if column not in ('country_name', 'regional_indicator')]
+
+    results = {
+        'happy_df': df,
+        'sorted_happy_df': backend.sort(df, 'happiness_score'),
+        'sorted_by_corruption': backend.sort(df, 'perceptions_of_corruption'),
+        'gdp_region': backend.group_agg(df, 'regional_indicator', 'logged_GDP_per_capita', 'sum'),
+        'total_country': backend.group_agg(df, 'regional_indicator', 'country_name', 'count'),
+        'corruption': backend.group_agg(df, 'regional_indicator', 'perceptions_of_corruption', 'mean'),
+        'region_scores': backend.group_agg(df, 'regional_indicator', 'happiness_score', 'mean'),
+        'correlation_matrix': backend.corr(df, numeric_columns)
+    }
+    return backend.collect_all(results)
+
+
+# #### Checking that both backends give the same results
+# 
+# The code below runs `happiness_pipeline()` on the 2021 csv with each backend and compares every result with `pd.testing.assert_frame_equal()`. The 2021 csv has no missing values, so the check is also run on a copy of it with one region and one happiness score blanked out, saved to a temporary folder that is deleted after the check. The check is skipped when Polars is not installed. The data types are not compared because Polars counts with unsigned integers, and the numbers are compared with a small tolerance because the two engines add up floats in a different order.
+
+# In[35]:
+
+
+if pl is not None:
+    missing_data = data.copy()
+    missing_data.loc[3, 'Regional indicator'] = np.nan
+    missing_data.loc[5, 'Happiness score'] = np.nan
+
+    with tempfile.TemporaryDirectory() as tmp:
+        missing_path = os.path.join(tmp, 'world-happiness-report-2021-missing.csv')
+        missing_data.to_csv(missing_path, index=False)
+        for path in [data_path, missing_path]:
+            expected = happiness_pipeline(PandasBackend(), path)
+            polars_results = happiness_pipeline(PolarsBackend(), path)
+            for name in expected:
+                pd.testing.assert_frame_equal(expected[name], polars_results[name], check_dtype=False)
+    print('pandas and polars backends give the same results')
+
+
+# #### Running the analysis
+# 
+# The rest of the notebook uses the results of `happiness_pipeline()` on the pandas backend, run on the `data` DataFrame loaded at the start. `happy_df` is the 2021 data with the selected columns and the new variable names, in the same order as the csv. Passing `PolarsBackend()` instead runs the same analysis on Polars.
+
+# In[48]:
+
+
+pipeline_results = happiness_pipeline(PandasBackend(), data)
+happy_df = pipeline_results['happy_df']
 
 
 # In[8]:
@@ -263,16 +402,10 @@ fig.show()
 # This code below calculates and visualizes the correlation matrix for the numeric columns in the happy_df dataframe using the seaborn library.
 # 
 # 
-# - The code first selects only the numeric columns from the `happy_df` DataFrame using the `select_dtypes()` method. The `include=[float, int]` argument ensures that only columns with data types of `float` or `int` are considered as numeric.
-# 
-# 
-# - The resulting numeric column names are stored in the `numeric_columns` variable.
-# 
+# - The correlation matrix of the numeric columns of `happy_df` is calculated by `happiness_pipeline()` with the `corr()` method of the backend.
 # 
-# - The correlation matrix is calculated using the `corr()` method on the numeric columns of the `happy_df` DataFrame.
 # 
-# 
-# - The resulting correlation matrix is stored in the `correlation_matrix` variable.
+# - The `variable` column of the result is set as the index and the matrix is stored in the `correlation_matrix` variable.
 # 
 # 
 # - A new figure with a size of 10x8 inches is created using `plt.figure(figsize=(10, 8))`.
@@ -299,9 +432,8 @@ fig.show()
 # In[11]:
 
 
-# Select only the numeric columns for correlation matrix calculation
-numeric_columns = happy_df.select_dtypes(include=[float, int]).columns
-correlation_matrix = happy_df[numeric_columns].corr()
+# Correlation matrix of the numeric columns calculated by happiness_pipeline()
+correlation_matrix = pipeline_results['correlation_matrix'].set_index('variable').rename_axis(None)
 
 # Create a heatmap of the correlation matrix
 plt.figure(figsize=(10, 8))
@@ -345,7 +477,7 @@ plt.ylabel('GDP per capita')
 
 # ### Total Logged GDP Per Capita for each regional indicators
 # 
-# To calculate the total logged GDP per capita for each regional indicator in the `happy_df` DataFrame, the code utilizes the `groupby()` function in conjunction with the `sum()` function.
+# To calculate the total logged GDP per capita for each regional indicator in the `happy_df` DataFrame, the code reads the `gdp_region` result of `happiness_pipeline()`, which groups the data by region and sums each group.
 # 
 # The resulting output displays the total logged GDP per capita for each regional indicator:
 # 
@@ -359,7 +491,7 @@ plt.ylabel('GDP per capita')
 # In[13]:
 
 
-gdp_region = happy_df.groupby('regional_indicator')['logged_GDP_per_capita'].sum()
+gdp_region = pipeline_results['gdp_region'].set_index('regional_indicator')['logged_GDP_per_capita']
 print(gdp_region)
 
 
@@ -378,7 +510,7 @@ plt.ylabel('')
 
 # ### Total Countries Per region
 # 
-# To calculate the total number of countries within each regional indicator, the code below uses the `groupby()` function on the `happy_df` DataFrame. The `groupby()` function groups the data based on the 'regional_indicator' column.
+# To calculate the total number of countries within each regional indicator, the code below reads the `total_country` result of `happiness_pipeline()`. The pipeline groups the data based on the 'regional_indicator' column.
 # 
 # The resulting output displays the count of countries for each regional indicator:
 # 
@@ -396,13 +528,13 @@ plt.ylabel('')
 
 # Total countries
 
-total_country = happy_df.groupby('regional_indicator')[['country_name']].count()
+total_country = pipeline_results['total_country'].set_index('regional_indicator')
 print(total_country)
 
 
 # ### Perception of Corruption in different regions
 # 
-# To analyze the perceptions of corruption across different regions, the code uses the `groupby()` function on the `happy_df` DataFrame. It groups the data based on the 'regional_indicator' column.
+# To analyze the perceptions of corruption across different regions, the code reads the `corruption` result of `happiness_pipeline()`. The pipeline groups the data based on the 'regional_indicator' column.
 # 
 # The resulting output displays the average perceptions of corruption for each regional indicator:
 # 
@@ -419,7 +551,7 @@ print(total_country)
 
 # Corruption in different regions
 
-corruption = happy_df.groupby('regional_indicator')[['perceptions_of_corruption']].mean()
+corruption = pipeline_results['corruption'].set_index('regional_indicator')
 print(corruption)
 
 
@@ -528,7 +660,7 @@ plt.ylabel('Happiness Score')
 # In[21]:
 
 
-country = happy_df.sort_values(by = 'perceptions_of_corruption').head(10)
+country = pipeline_results['sorted_by_corruption'].head(10)
 plt.rcParams['figure.figsize'] = (12, 6)
 plt.title('countries with the least perception of Corruption')
 plt.xlabel('Country', fontsize = 13)
@@ -543,7 +675,7 @@ plt.bar(country["country_name"], country["perceptions_of_corruption"], color=['r
 # In[22]:
 
 
-country = happy_df.sort_values(by = 'perceptions_of_corruption').tail(10)
+country = pipeline_results['sorted_by_corruption'].tail(10)
 plt.rcParams['figure.figsize'] = (12, 6)
 plt.title('countries with the most perception of Corruption')
 plt.xlabel('Country', fontsize = 13)
@@ -624,7 +756,7 @@ fig.show()
 # 
 # The code below groups the data by regional indicators and calculates the mean happiness score for each region. It then creates a bar plot to visualize the average happiness score by regional indicators.
 # 
-# - `region_scores` is created by grouping the `happy_df` DataFrame by the 'regional_indicator' column and calculating the mean of the 'happiness_score' column using `.groupby('regional_indicator')['happiness_score'].mean()`. The `reset_index()` function is then used to convert the resulting Series back to a DataFrame.
+# - `region_scores` is the result of `happiness_pipeline()` that groups the `happy_df` DataFrame by the 'regional_indicator' column and calculates the mean of the 'happiness_score' column, with one row per region.
 # 
 # - `px.bar()` from the `plotly.express` module is used to create a bar plot. The `region_scores` DataFrame is specified as the data source. The 'regional_indicator' column is assigned to the x-axis (`x='regional_indicator'`), and the 'happiness_score' column is assigned to the y-axis (`y='happiness_score'`). The `title` parameter sets the title of the bar plot, and the `labels` parameter is used to customize the axis labels.
 # 
@@ -633,8 +765,8 @@ fig.show()
 # In[25]:
 
 
-# Group the data by regional indicators and calculate the mean happiness score
-region_scores = happy_df.groupby('regional_indicator')['happiness_score'].mean().reset_index()
+# Mean happiness score of each regional indicator
+region_scores = pipeline_results['region_scores']
 
 # Create the bar plot
 fig = px.bar(region_scores, x='regional_indicator', y='happiness_score', 
@@ -651,7 +783,7 @@ fig.show()
 # 
 # - `year = 2021` sets the year for the dataset.
 # 
-# - `happy_df = happy_df.sort_values('happiness_score')` sorts the `happy_df` DataFrame in ascending order based on the 'happiness_score' column. This ensures that the line graph displays the countries in increasing order of happiness score.
+# - `happy_df = pipeline_results['sorted_happy_df']` uses the `happy_df` DataFrame sorted in ascending order based on the 'happiness_score' column. This ensures that the line graph displays the countries in increasing order of happiness score.
 # 
 # - `fig = px.line()` from the `plotly.express` module creates a line graph. The `happy_df` DataFrame is specified as the data source. The 'country_name' column is assigned to the x-axis (`x='country_name'`), and the 'happiness_score' column is assigned to the y-axis (`y='happiness_score'`). The `title` parameter sets the title of the line graph, and the `labels` parameter is used to customize the axis labels.
 # 
@@ -665,7 +797,7 @@ fig.show()
 year = 2021
 
 # Sort the data by ascending order of happiness score
-happy_df = happy_df.sort_values('happiness_score')
+happy_df = pipeline_results['sorted_happy_df']
 
 # Create the line graph
 fig = px.line(happy_df, x='country_name', y='happiness_score', 
@@ -690,7 +822,7 @@ fig.show()
 # 
 # - `year = 2021` sets the year for the dataset.
 # 
-# - `happy_df = happy_df.sort_values('happiness_score')` sorts the `happy_df` DataFrame in ascending order based on the 'happiness_score' column. This ensures that the line graph displays the countries in increasing order of happiness score.
+# - `happy_df = pipeline_results['sorted_happy_df']` uses the `happy_df` DataFrame sorted in ascending order based on the 'happiness_score' column. This ensures that the line graph displays the countries in increasing order of happiness score.
 # 
 #  - `fig = px.line()` from the `plotly.express` module creates a line graph. The `happy_df` DataFrame is specified as the data source. The 'country_name' column is assigned to the x-axis (`x='country_name'`), and the 'happiness_score' column is assigned to the y-axis (`y='happiness_score'`). The `color` parameter is set to 'regional_indicator' to group the lines by regional indicators. The `title` parameter sets the title of the line graph, and the `labels` parameter is used to customize the axis labels.
 #  
@@ -704,7 +836,7 @@ fig.show()
 year = 2021
 
 # Sort the data by ascending order of happiness score
-happy_df = happy_df.sort_values('happiness_score')
+happy_df = pipeline_results['sorted_happy_df']
 
 # Create the line graph
 fig = px.line(happy_df, x='country_name', y='happiness_score', color='regional_indicator',
@@ -741,7 +873,7 @@ fig.show()
 # 
 # - `year = 2021` sets the year for the dataset.
 # 
-# - `happy_df = happy_df.sort_values('happiness_score')` sorts the `happy_df` DataFrame in ascending order based on the 'happiness_score' column. This ensures that the line graph displays the countries in increasing order of happiness score.
+# - `happy_df = pipeline_results['sorted_happy_df']` uses the `happy_df` DataFrame sorted in ascending order based on the 'happiness_score' column. This ensures that the line graph displays the countries in increasing order of happiness score.
 # 
 # - `fig = px.line()` from the `plotly.express` module creates a line graph. The `happy_df` DataFrame is specified as the data source. The 'country_name' column is assigned to the x-axis (`x='country_name'`), and the 'happiness_score' column is assigned to the y-axis (`y='happiness_score'`). The `color` parameter is set to 'regional_indicator' to group the lines by regional indicators. The `title` parameter sets the title of the line graph, and the `labels` parameter is used to customize the axis labels.
 # 
@@ -765,6 +897,596 @@ plt.xticks(rotation=45, ha='right')
 plt.show()
 
 
+# ### Loading the 2018, 2019 and 2021 reports together
+# 
+# The analysis above only uses the 2021 report. To look at how countries move between years, the code below loads every report in the `Datasets` folder into one long DataFrame called `years_df`, with one row per country per year.
+# 
+# - `happy_years` maps each report year to its csv file.
+# 
+# - The column names of each report are stripped of stray spaces (the 2018 file has `' Logged GDP per capita'`) and renamed with the same `column_names` dictionary used for `happy_df`.
+# 
+# - `country_aliases` maps the older spellings of a few countries to the spelling used in the 2021 report, so that the same country lines up across years.
+# 
+# - The 2018 and 2019 reports do not have a regional indicator, so the region of each country is looked up from `happy_df`. `extra_regions` covers the countries that are not in the 2021 report.
+# 
+# - `overall_rank` is recalculated within each year from the happiness score.
+# 
+# Note that the 2018 and 2019 reports publish the factor columns on a different scale to 2021 (for example GDP is around 1.3 instead of 10.8 for Finland), so the factors should only be compared within a year. In those two reports a higher `perceptions_of_corruption` also means *less* perceived corruption, the opposite of 2021. `years_df` keeps the published values, and `reversed_corruption_years` lists the years where the direction is reversed so that later cells can flip them when comparing years.
+
+# In[31]:
+
+
+happy_years = {
+    2018: 'Datasets/world-happiness-report-2018.csv',
+    2019: 'Datasets/world-happiness-report-2019.csv',
+    2021: 'Datasets/world-happiness-report-2021.csv'
+}
+
+# Years where a higher perceptions_of_corruption value means less corruption
+reversed_corruption_years = [2018, 2019]
+
+country_aliases = {
+    'Trinidad & Tobago': 'Trinidad and Tobago',
+    'Northern Cyprus': 'North Cyprus',
+    'Macedonia': 'North Macedonia',
+    'Hong Kong': 'Hong Kong S.A.R. of China',
+    'Taiwan': 'Taiwan Province of China'
+}
+
+extra_regions = {
+    'Angola': 'Sub-Saharan Africa',
+    'Belize': 'Latin America and Caribbean',
+    'Bhutan': 'South Asia',
+    'Central African Republic': 'Sub-Saharan Africa',
+    'Congo (Kinshasa)': 'Sub-Saharan Africa',
+    'Qatar': 'Middle East and North Africa',
+    'Somalia': 'Sub-Saharan Africa',
+    'South Sudan': 'Sub-Saharan Africa',
+    'Sudan': 'Sub-Saharan Africa',
+    'Syria': 'Middle East and North Africa',
+    'Trinidad and Tobago': 'Latin America and Caribbean'
+}
+
+year_frames = []
+for year, path in happy_years.items():
+    frame = pd.read_csv(path, encoding='utf-8-sig')
+    frame.columns = frame.columns.str.strip()
+    frame = frame[[column for column in data_columns if column in frame.columns]].rename(columns=column_names)
+    frame['country_name'] = frame['country_name'].replace(country_aliases)
+    frame['year'] = year
+    frame['overall_rank'] = frame['happiness_score'].rank(ascending=False, method='min').astype(int)
+    year_frames.append(frame)
+
+years_df = pd.concat(year_frames, ignore_index=True)
+
+region_lookup = {**extra_regions, **happy_df.set_index('country_name')['regional_indicator'].to_dict()}
+years_df['regional_indicator'] = years_df['country_name'].map(region_lookup)
+
+years_df.head()
+
+
+# ### Animated scatterplots of happiness across the years
+# 
+# The three scatterplots above (happiness against GDP, freedom and corruption) only show 2021. The code below builds a Gapminder style animation that moves every country from one report year to the next.
+# 
+# - `animate_scatter()` creates one figure with one subplot per metric. Each subplot gets a single `ax.scatter()` artist when the figure is built, and the axis limits, labels and legend are drawn once.
+# 
+# - Each metric is turned into a years x countries array with `pivot()`, so every frame is a few numpy operations instead of filtering the DataFrame again.
+# 
+# - The sign of `perceptions_of_corruption` is flipped for the years in `reversed_corruption_years` before plotting, so that a higher value means more perceived corruption in every year.
+# 
+# - `steps` is the number of frames for each calendar year, so the gap between 2019 and 2021 takes twice as long as the gap between 2018 and 2019 and the animation moves at a steady rate. The year label counts up through the years in between.
+# 
+# - `update()` is called for each frame. It interpolates each country's position between two report years and only changes the marker artists with `set_offsets()`, `set_sizes()` and `set_facecolors()`. Countries that are missing from a year fade out by shrinking their size and alpha.
+# 
+# - `FuncAnimation(..., blit=True)` means only the markers and the year label are redrawn in each frame, the axes are reused from the first draw. This keeps the frame rate steady even with thousands of points.
+# 
+# - Because the factors are published on different scales in each report (see above), `standardize=True` converts each metric to a z-score within its year before plotting.
+# 
+# - The animation is saved as a gif with `PillowWriter` at a fixed `fps`. Passing `FFMpegWriter(fps=fps)` to `save()` instead writes an mp4 video if ffmpeg is installed.
+
+# In[32]:
+
+
+def animate_scatter(df, metrics=('logged_GDP_per_capita', 'freedom_to_make_life_choices', 'perceptions_of_corruption'),
+                    steps=12, fps=24, size=200, standardize=True):
+    metrics = list(metrics)
+    years = sorted(df['year'].unique())
+    countries = sorted(df['country_name'].unique())
+    regions = sorted(df['regional_indicator'].dropna().unique())
+    palette = dict(zip(regions, sns.color_palette('tab10', len(regions))))
+
+    values = df.copy()
+    if 'perceptions_of_corruption' in metrics:
+        reversed_rows = values['year'].isin(reversed_corruption_years)
+        values.loc[reversed_rows, 'perceptions_of_corruption'] = -values.loc[reversed_rows, 'perceptions_of_corruption']
+    if standardize:
+        by_year = values.groupby('year')[metrics]
+        values[metrics] = (values[metrics] - by_year.transform('mean')) / by_year.transform('std')
+
+    # One (years x countries) array per column, NaN where a country is missing from a year
+    def to_grid(column):
+        return (values.pivot(index='year', columns='country_name', values=column)
+                .reindex(index=years, columns=countries).to_numpy())
+
+    y_grid = to_grid('happiness_score')
+    x_grids = [to_grid(metric) for metric in metrics]
+    present = ~np.isnan(y_grid)
+
+    country_regions = values.drop_duplicates('country_name').set_index('country_name')['regional_indicator'].reindex(countries)
+    base_colors = np.array([(*palette.get(region, (0.5, 0.5, 0.5)), 1.0) for region in country_regions])
+
+    # Draw the static parts of the figure once
+    fig, axes = plt.subplots(1, len(metrics), figsize=(18, 7), sharey=True)
+    axes = np.atleast_1d(axes)
+    y_pad = (np.nanmax(y_grid) - np.nanmin(y_grid)) * 0.05
+    scatters = []
+    for ax, metric, x_grid in zip(axes, metrics, x_grids):
+        x_pad = (np.nanmax(x_grid) - np.nanmin(x_grid)) * 0.05
+        ax.set_xlim(np.nanmin(x_grid) - x_pad, np.nanmax(x_grid) + x_pad)
+        ax.set_ylim(np.nanmin(y_grid) - y_pad, np.nanmax(y_grid) + y_pad)
+        ax.set_xlabel(metric.replace('_', ' ') + (' (z-score)' if standardize else ''))
+        scatters.append(ax.scatter(np.zeros(len(countries)), np.zeros(len(countries)), s=0, animated=True))
+    axes[0].set_ylabel('Happiness Score')
+    year_text = axes[0].text(0.03, 0.93, '', transform=axes[0].transAxes, fontsize=20, animated=True)
+    fig.legend(handles=[Line2D([], [], marker='o', linestyle='', color=palette[region], label=region) for region in regions],
+               loc='lower center', ncol=5, fontsize='10')
+    fig.subplots_adjust(bottom=0.25)
+
+    def lerp(grid, i, j, t):
+        start, end = grid[i], grid[j]
+        return np.where(np.isnan(start), end, np.where(np.isnan(end), start, start + (end - start) * t))
+
+    # (report index, fraction of the way to the next report) for every frame, with `steps` frames per calendar year
+    schedule = [(i, step / (steps * gap)) for i, gap in enumerate(np.diff(years)) for step in range(steps * gap)]
+    schedule.append((len(years) - 1, 0.0))
+
+    def update(frame):
+        i, t = schedule[frame]
+        j = min(i + 1, len(years) - 1)
+        y = lerp(y_grid, i, j, t)
+        alpha = (1 - t) * present[i] + t * present[j]
+        colors = base_colors.copy()
+        colors[:, 3] = alpha
+        for scatter, x_grid in zip(scatters, x_grids):
+            scatter.set_offsets(np.column_stack([lerp(x_grid, i, j, t), y]))
+            scatter.set_sizes(size * alpha)
+            scatter.set_facecolors(colors)
+        year_text.set_text(str(int(years[i] + (years[j] - years[i]) * t)))
+        return (*scatters, year_text)
+
+    return FuncAnimation(fig, update, frames=len(schedule), init_func=lambda: update(0), interval=1000 / fps, blit=True)
+
+
+# In[33]:
+
+
+fps = 24
+scatter_animation = animate_scatter(years_df, fps=fps)
+scatter_animation.save('Datasets/output.png/animated scatterplots of happiness by year.gif', writer=PillowWriter(fps=fps))
+
+
+# ### What-if happiness index with your own factor weights
+# 
+# The happiness score is a single number, but it is interesting to ask how the ranking would look if the six factors were weighted differently. The code below scores thousands of weightings at once and reports how stable each country's rank is.
+# 
+# - `factor_matrix` holds the six factor columns of `happy_df`, standardized to z-scores so that every factor has the same scale. Missing values are set to 0 (the average).
+# 
+# - `score_scenarios()` takes a 2D array of weights with one row per scenario and one column per factor. All scenarios are scored with one matrix multiplication, `weights @ factor_matrix.T`, which gives a scenarios x countries array of index values.
+# 
+# - `rank_scenarios()` turns the scores into ranks for every scenario with `np.argsort()`, and `top_countries()` uses `np.argpartition()` to pick the top `k` countries of each scenario without sorting the full row.
+# 
+# - `rank_stability()` summarises the ranks of each country across all scenarios: the mean, standard deviation, best and worst rank, and the share of scenarios where the country is in the top 10.
+# 
+# Higher perceptions of corruption is worse, so a negative weight should be given to `perceptions_of_corruption` for it to lower the index.
+
+# In[36]:
+
+
+factor_columns = ['logged_GDP_per_capita', 'social_support', 'healthy_life_expectancy',
+                  'freedom_to_make_life_choices', 'generosity', 'perceptions_of_corruption']
+
+factor_df = happy_df.set_index('country_name')[factor_columns]
+factor_matrix = ((factor_df - factor_df.mean()) / factor_df.std()).fillna(0).to_numpy()
+factor_countries = factor_df.index.to_numpy()
+
+
+def score_scenarios(weights):
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    return weights @ factor_matrix.T
+
+
+def rank_scenarios(scores):
+    order = np.argsort(-scores, axis=1, kind='stable')
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, scores.shape[1] + 1)[None, :], axis=1)
+    return ranks
+
+
+def top_countries(scores, k=10):
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top = np.take_along_axis(top, np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1), axis=1)
+    return factor_countries[top]
+
+
+def rank_stability(ranks, top=10):
+    return pd.DataFrame({
+        'mean_rank': ranks.mean(axis=0),
+        'rank_std': ranks.std(axis=0),
+        'best_rank': ranks.min(axis=0),
+        'worst_rank': ranks.max(axis=0),
+        f'share_in_top_{top}': (ranks <= top).mean(axis=0)
+    }, index=pd.Index(factor_countries, name='country_name')).sort_values('mean_rank')
+
+
+# #### Scenario sweep
+# 
+# The code below draws 10,000 random weightings with `np.random.default_rng().dirichlet()`, so the weights of each scenario are positive and add up to 1. The corruption weight is then made negative. The table shows the countries with the best average rank, and `rank_std` shows how much their rank moves when the weights change.
+
+# In[37]:
+
+
+rng = np.random.default_rng(2021)
+scenario_weights = rng.dirichlet(np.ones(len(factor_columns)), size=10_000)
+scenario_weights[:, factor_columns.index('perceptions_of_corruption')] *= -1
+
+scenario_scores = score_scenarios(scenario_weights)
+scenario_ranks = rank_scenarios(scenario_scores)
+stability = rank_stability(scenario_ranks)
+stability.head(10)
+
+
+# #### Interactive weight sliders
+# 
+# `widgets.interact()` from `ipywidgets` adds one slider per factor. Every time a slider moves, the weights are scored as a single scenario and the new top 10 countries are shown.
+
+# In[38]:
+
+
+def show_weighted_ranking(**weights):
+    scores = score_scenarios([weights[column] for column in factor_columns])
+    print('\n'.join(f'{rank}. {country}' for rank, country in enumerate(top_countries(scores)[0], start=1)))
+
+
+widgets.interact(show_weighted_ranking, **{
+    column: widgets.FloatSlider(value=-1.0 if column == 'perceptions_of_corruption' else 1.0, min=-2.0, max=2.0, step=0.1,
+                                description=column.replace('_', ' '), style={'description_width': 'initial'})
+    for column in factor_columns
+})
+
+
+# ### Testing the differences between regions
+# 
+# The box plot and the mean happiness bar chart show that some regions are happier than others, but not whether the differences are bigger than what could happen by chance. The code below adds hypothesis tests for the happiness score and the six factors.
+# 
+# - `region_tests()` runs a one-way ANOVA (`stats.f_oneway()`) and a Kruskal-Wallis test (`stats.kruskal()`) across all regions for each metric. ANOVA compares the region means, and Kruskal-Wallis compares the ranks so it does not assume the scores are normally distributed.
+# 
+# - `permutation_pair_test()` tests one pair of regions. It is imported from `region_permutation.py`, next to this notebook. The observed statistic is the difference between the two region means. The region labels of the countries in the pair are then shuffled many times, and the p-value is the share of shuffles with a difference at least as large as the observed one.
+# 
+# - The shuffles are made in blocks: `rng.permuted()` shuffles a whole block of label rows at once, and the region means of every shuffle and every metric are then calculated with one matrix multiplication.
+# 
+# - `pairwise_permutation_tests()` sends each pair of regions to a separate process with `ProcessPoolExecutor`, so all CPU cores are used. Each pair gets its own random seed from `np.random.SeedSequence().spawn()`, so the results are the same every time.
+# 
+# - With 10 regions and 7 metrics there are 315 tests, so `adjust_pvalues()` corrects the p-values for multiple comparisons with the Holm method (or Benjamini-Hochberg with `method='fdr_bh'`).
+# 
+# `permutation_pair_test()` is kept in its own module because on Windows, macOS and newer Linux the worker processes are started fresh and have to import the function they run, which is not possible for a function defined in the notebook. `max_workers=1` runs the pairs one after another without the pool.
+
+# In[39]:
+
+
+region_metrics = ['happiness_score'] + factor_columns
+
+
+def region_tests(df, metrics=region_metrics):
+    rows = []
+    for metric in metrics:
+        groups = [group.dropna().to_numpy() for _, group in df.groupby('regional_indicator')[metric]]
+        f_stat, f_p_value = stats.f_oneway(*groups)
+        h_stat, h_p_value = stats.kruskal(*groups)
+        rows.append({'metric': metric, 'anova_F': f_stat, 'anova_p_value': f_p_value,
+                     'kruskal_H': h_stat, 'kruskal_p_value': h_p_value})
+    return pd.DataFrame(rows).set_index('metric')
+
+
+def adjust_pvalues(p_values, method='holm'):
+    p_values = np.asarray(p_values, dtype=float)
+    n = len(p_values)
+    order = np.argsort(p_values)
+    if method == 'holm':
+        adjusted = np.maximum.accumulate((n - np.arange(n)) * p_values[order])
+    elif method == 'fdr_bh':
+        adjusted = np.minimum.accumulate(n / np.arange(n, 0, -1) * p_values[order][::-1])[::-1]
+    else:
+        raise ValueError(f"Unknown method '{method}', use 'holm' or 'fdr_bh'")
+    result = np.empty(n)
+    result[order] = np.minimum(adjusted, 1)
+    return result
+
+
+def pairwise_permutation_tests(df, metrics=region_metrics, n_permutations=100_000, block_size=10_000,
+                               method='holm', max_workers=None, seed=2021):
+    regions = sorted(df['regional_indicator'].dropna().unique())
+    pairs = list(itertools.combinations(regions, 2))
+    seeds = np.random.SeedSequence(seed).spawn(len(pairs))
+
+    tasks = []
+    for (region_a, region_b), pair_seed in zip(pairs, seeds):
+        subset = df[df['regional_indicator'].isin([region_a, region_b])]
+        in_a = (subset['regional_indicator'] == region_a).to_numpy()
+        tasks.append((subset[metrics].to_numpy(dtype=float), in_a, n_permutations, block_size, pair_seed))
+
+    if max_workers == 1:
+        results = [permutation_pair_test(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(permutation_pair_test, *zip(*tasks)))
+
+    rows = []
+    for (region_a, region_b), (observed, p_values) in zip(pairs, results):
+        for metric, difference, p_value in zip(metrics, observed, p_values):
+            rows.append({'metric': metric, 'region_a': region_a, 'region_b': region_b,
+                         'mean_difference': difference, 'p_value': p_value})
+
+    table = pd.DataFrame(rows)
+    table['p_adjusted'] = adjust_pvalues(table['p_value'], method)
+    table['significant'] = table['p_adjusted'] < 0.05
+    return table.sort_values(['metric', 'p_adjusted']).reset_index(drop=True)
+
+
+# In[40]:
+
+
+region_tests(happy_df)
+
+
+# In[41]:
+
+
+pair_tests = pairwise_permutation_tests(happy_df)
+pair_tests[pair_tests['metric'] == 'happiness_score'].head(10)
+
+
+# ### Rollup cube of year x region x metric
+# 
+# The regional numbers above (`gdp_region`, `total_country`, `corruption` and `region_scores`) are each calculated again from the rows of `happy_df`, and only for 2021. The code below calculates them once for every year, region and metric and stores them in a small table called `rollup_cube`, so any regional number can be read from the cube instead.
+# 
+# - `build_cube()` melts the metric columns of `years_df` into long format and groups by `year`, `regional_indicator` and `metric`. Each group stores the `count`, `sum`, `sum_sq` (sum of squares), `min` and `max`.
+# 
+# - These five aggregates can be added together (or take the min and max) across groups, so `rollup()` can combine the cells into any coarser level, for example one row per region over all years, or one row per metric for the whole world. The mean, variance and standard deviation are then calculated from the combined aggregates.
+# 
+# - The six factors are published on a different scale in each report (see the note on `years_df`), so adding them up across years gives meaningless numbers. `rollup()` takes a `metrics` argument to choose which metrics to combine (all of them by default), and raises a `ValueError` when it would combine more than one year of a metric that is not in `cross_year_metrics` (the happiness score and the overall rank, which mean the same thing in every year). The factors can still be rolled up within a year, for example by region or for the whole world.
+# 
+# - `update_cube()` replaces the cells of one year only. When a year's report is added or corrected, only that year's rows are grouped again and the rest of the cube is kept as it is.
+
+# In[42]:
+
+
+cube_metrics = region_metrics + ['overall_rank']
+cross_year_metrics = ['happiness_score', 'overall_rank']
+
+
+def build_cube(df, metrics=cube_metrics):
+    long_df = df.melt(id_vars=['year', 'regional_indicator'], value_vars=metrics, var_name='metric').dropna(subset=['value'])
+    long_df['value_sq'] = long_df['value'] ** 2
+    return (long_df.groupby(['year', 'regional_indicator', 'metric'])
+            .agg(count=('value', 'count'), sum=('value', 'sum'), sum_sq=('value_sq', 'sum'),
+                 min=('value', 'min'), max=('value', 'max')))
+
+
+def update_cube(cube, year_df):
+    years = year_df['year'].unique()
+    kept = cube[~cube.index.get_level_values('year').isin(years)]
+    return pd.concat([kept, build_cube(year_df)]).sort_index()
+
+
+def rollup(cube, by=('regional_indicator', 'metric'), metrics=None):
+    if metrics is not None:
+        cube = cube[cube.index.get_level_values('metric').isin(metrics)]
+
+    # Only metrics with the same scale in every year can be combined across years
+    if 'year' in cube.index.names and 'year' not in by and cube.index.get_level_values('year').nunique() > 1:
+        mixed = sorted(set(cube.index.get_level_values('metric')) - set(cross_year_metrics))
+        if mixed:
+            raise ValueError(f'Cannot roll up {mixed} across years because their scale changes between reports, '
+                             f'pass metrics=cross_year_metrics or include year in by')
+
+    rolled = cube.groupby(level=list(by)).agg({'count': 'sum', 'sum': 'sum', 'sum_sq': 'sum', 'min': 'min', 'max': 'max'})
+    rolled['mean'] = rolled['sum'] / rolled['count']
+    rolled['var'] = (rolled['sum_sq'] - rolled['sum'] ** 2 / rolled['count']) / (rolled['count'] - 1)
+    rolled['std'] = np.sqrt(rolled['var'].clip(lower=0))
+    return rolled
+
+
+rollup_cube = build_cube(years_df)
+rollup_cube.head()
+
+
+# #### Answering the regional questions from the cube
+# 
+# The code below reads the 2021 regional numbers from the cube with `rollup_cube.xs()` and checks that they match the ones calculated from `happy_df` earlier. It then rolls up to all years for each region and to the whole world for each metric, and drills down into one region in one year.
+
+# In[43]:
+
+
+cube_2021 = rollup(rollup_cube.xs(2021, level='year', drop_level=False))
+
+cube_gdp_region = cube_2021.xs('logged_GDP_per_capita', level='metric')['sum']
+cube_total_country = cube_2021.xs('happiness_score', level='metric')['count']
+cube_corruption = cube_2021.xs('perceptions_of_corruption', level='metric')['mean']
+cube_region_scores = cube_2021.xs('happiness_score', level='metric')['mean']
+
+assert np.allclose(cube_gdp_region, gdp_region)
+assert (cube_total_country == total_country['country_name']).all()
+assert np.allclose(cube_corruption, corruption['perceptions_of_corruption'])
+assert np.allclose(cube_region_scores, region_scores.set_index('regional_indicator')['happiness_score'])
+
+# Roll up: each region over all years (happiness score and rank only), and the whole world for each metric and year
+region_all_years = rollup(rollup_cube, by=['regional_indicator', 'metric'], metrics=cross_year_metrics)
+world_by_year = rollup(rollup_cube, by=['year', 'metric'])
+print(region_all_years.xs('happiness_score', level='metric')[['count', 'mean', 'std', 'min', 'max']])
+print(world_by_year.xs('happiness_score', level='metric')[['count', 'mean', 'std']])
+
+# Drill down: one region in one year
+rollup_cube.loc[(2021, 'Western Europe')]
+
+
+# #### Updating one year
+# 
+# If the 2019 report is corrected, only its rows need to be passed to `update_cube()`. The cells of 2018 and 2021 are not recalculated.
+
+# In[44]:
+
+
+rollup_cube = update_cube(rollup_cube, years_df[years_df['year'] == 2019])
+
+
+# ### Searching for a country by name
+# 
+# Looking up a country in `happy_df` needs the exact `country_name`, and a few countries are spelled differently in the 2018, 2019 and 2021 reports. The code below builds a search index over the country names and common aliases, so a country can be found with a typo or from the first few letters, for example in a dashboard search box.
+# 
+# - `normalize_name()` lowercases a name, replaces `&` with `and` and removes punctuation, so `'Trinidad & Tobago'` and `'trinidad and tobago'` give the same key.
+# 
+# - `country_profiles` is a dictionary (hash index) from each country name to its full profile: the region and, for every year, the rank and all the metrics. It is built once from `years_df`, so a match does not need to filter the DataFrame again.
+# 
+# - `CountrySearch` indexes every name and alias in two ways:
+#     - an inverted index from each trigram (3 letter piece of the name) to the names that contain it, used by `lookup()` for typo tolerant search. The candidates are ranked by how many trigrams they share with the query (Jaccard similarity).
+#     - a prefix trie over the start of every word of every name, used by `autocomplete()`. Each node of the trie keeps its matches already sorted (names that start with the prefix first, then by the latest happiness rank), so a query only walks down the trie and reads the first few matches.
+# 
+# - `country_name_aliases` adds common alternative names, and the older spellings in `country_aliases` are also indexed.
+
+# In[45]:
+
+
+country_name_aliases = {
+    'USA': 'United States',
+    'United States of America': 'United States',
+    'UK': 'United Kingdom',
+    'Great Britain': 'United Kingdom',
+    'Czechia': 'Czech Republic',
+    "Cote d'Ivoire": 'Ivory Coast',
+    'Eswatini': 'Swaziland',
+    'Republic of Korea': 'South Korea',
+    'Burma': 'Myanmar',
+    'Palestine': 'Palestinian Territories',
+    **country_aliases
+}
+
+
+def normalize_name(name):
+    name = name.lower().replace('&', ' and ')
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', name).split())
+
+
+def trigrams(key):
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def build_profiles(df):
+    profiles = {}
+    for row in df.sort_values('year').to_dict('records'):
+        profile = profiles.setdefault(row['country_name'], {
+            'country_name': row['country_name'],
+            'regional_indicator': row['regional_indicator'],
+            'years': {}
+        })
+        profile['years'][row['year']] = {column: row[column] for column in ['overall_rank'] + region_metrics}
+    return profiles
+
+
+class CountrySearch:
+    def __init__(self, profiles, aliases):
+        self.profiles = profiles
+        names = {normalize_name(name): name for name in profiles}
+        names.update({normalize_name(alias): name for alias, name in aliases.items() if name in profiles})
+        self.keys = list(names)
+        self.countries = [names[key] for key in self.keys]
+        self.exact = {key: i for i, key in enumerate(self.keys)}
+
+        self.key_trigrams = [trigrams(key) for key in self.keys]
+        self.trigram_index = {}
+        for i, grams in enumerate(self.key_trigrams):
+            for gram in grams:
+                self.trigram_index.setdefault(gram, []).append(i)
+
+        # Each trie node is a dict of child letters, with the sorted matches under the '$' key
+        self.trie = {}
+        for i, key in enumerate(self.keys):
+            words = key.split()
+            for w in range(len(words)):
+                node = self.trie
+                for letter in ' '.join(words[w:]):
+                    node = node.setdefault(letter, {})
+                    node.setdefault('$', []).append((w > 0, self.latest_rank(self.countries[i]), self.countries[i]))
+        self.sort_trie(self.trie)
+
+    def latest_rank(self, country):
+        years = self.profiles[country]['years']
+        return years[max(years)]['overall_rank']
+
+    def sort_trie(self, node):
+        for letter, child in node.items():
+            if letter == '$':
+                continue
+            seen = set()
+            child['$'] = [country for _, _, country in sorted(child['$']) if not (country in seen or seen.add(country))]
+            self.sort_trie(child)
+
+    def lookup(self, query, limit=5, min_score=0.2):
+        key = normalize_name(query)
+        if key in self.exact:
+            return [(self.profiles[self.countries[self.exact[key]]], 1.0)]
+
+        query_trigrams = trigrams(key)
+        shared = {}
+        for gram in query_trigrams:
+            for i in self.trigram_index.get(gram, ()):
+                shared[i] = shared.get(i, 0) + 1
+
+        best = {}
+        for i, count in shared.items():
+            score = count / (len(query_trigrams) + len(self.key_trigrams[i]) - count)
+            country = self.countries[i]
+            if score >= min_score and score > best.get(country, 0):
+                best[country] = score
+        ranked = sorted(best.items(), key=lambda item: -item[1])[:limit]
+        return [(self.profiles[country], score) for country, score in ranked]
+
+    def autocomplete(self, prefix, limit=10):
+        node = self.trie
+        for letter in normalize_name(prefix):
+            node = node.get(letter)
+            if node is None:
+                return []
+        return node.get('$', [])[:limit]
+
+
+country_profiles = build_profiles(years_df)
+country_search = CountrySearch(country_profiles, country_name_aliases)
+
+
+# #### Using the search index
+# 
+# `lookup()` finds a country even when the name is misspelled or uses an old spelling, and returns its profile with a match score. `autocomplete()` returns the country names for a search box as the user types. `%timeit` shows that both take well under a millisecond.
+
+# In[46]:
+
+
+profile, score = country_search.lookup('Finlnad')[0]
+print(profile['country_name'], round(score, 2))
+print(pd.DataFrame(profile['years']).T)
+
+print(country_search.autocomplete('sw'))
+print(country_search.autocomplete('kong'))
+
+
+# In[47]:
+
+
+get_ipython().run_line_magic('timeit', "country_search.lookup('Trinidad & Tobbago')")
+get_ipython().run_line_magic('timeit', "country_search.autocomplete('sw')")
+
+
 # ### Conclusion
 # 
 # Based on the analysis and visualizations of the World Happiness Report 2021, the following key findings and insights can be concluded:
@@ -0,0 +1,27 @@
+# Permutation test for one pair of regions, used by pairwise_permutation_tests() in
+# "Happiness report 2021 Data Analysis Newest.py".
+#
+# It lives in its own module so that the workers of a ProcessPoolExecutor can import it
+# when new processes are started with spawn or forkserver (Windows, macOS and newer Linux).
+
+import numpy as np
+
+
+def permutation_pair_test(values, in_a, n_permutations, block_size, seed):
+    rng = np.random.default_rng(seed)
+    present = ~np.isnan(values)
+    filled = np.nan_to_num(values)
+
+    # Difference between the means of region a and region b, for each row of label masks and each metric
+    def mean_difference(masks):
+        sums_a, counts_a = masks @ filled, masks @ present
+        sums_b, counts_b = filled.sum(axis=0) - sums_a, present.sum(axis=0) - counts_a
+        return sums_a / counts_a - sums_b / counts_b
+
+    observed = mean_difference(in_a[None, :].astype(float))[0]
+    extreme = np.zeros(values.shape[1], dtype=int)
+    for start in range(0, n_permutations, block_size):
+        size = min(block_size, n_permutations - start)
+        masks = rng.permuted(np.tile(in_a, (size, 1)), axis=1).astype(float)
+        extreme += (np.abs(mean_difference(masks)) >= np.abs(observed) - 1e-12).sum(axis=0)
+    return observed, (extreme + 1) / (n_permutations + 1)